@@ -1,139 +1,127 @@
 from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
+import heapq
 import io
 import re
-from collections import Counter
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer
+import pypdf
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
 import os
 
-# Download required NLTK data
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-    
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords')
+# NLTK's English stop word list, shipped inline so no corpus download is
+# needed at runtime
+STOP_WORDS = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you',
+    "you're", "you've", "you'll", "you'd", 'your', 'yours', 'yourself',
+    'yourselves', 'he', 'him', 'his', 'himself', 'she', "she's", 'her',
+    'hers', 'herself', 'it', "it's", 'its', 'itself', 'they', 'them',
+    'their', 'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this',
+    'that', "that'll", 'these', 'those', 'am', 'is', 'are', 'was', 'were',
+    'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does',
+    'did', 'doing', 'a', 'an', 'the', 'and', 'but', 'if', 'or', 'because',
+    'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about',
+    'against', 'between', 'into', 'through', 'during', 'before', 'after',
+    'above', 'below', 'to', 'from', 'up', 'down', 'in', 'out', 'on', 'off',
+    'over', 'under', 'again', 'further', 'then', 'once', 'here', 'there',
+    'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few',
+    'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not', 'only',
+    'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can', 'will',
+    'just', 'don', "don't", 'should', "should've", 'now', 'd', 'll', 'm',
+    'o', 're', 've', 'y', 'ain', 'aren', "aren't", 'couldn', "couldn't",
+    'didn', "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn',
+    "hasn't", 'haven', "haven't", 'isn', "isn't", 'ma', 'mightn',
+    "mightn't", 'mustn', "mustn't", 'needn', "needn't", 'shan', "shan't",
+    'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won',
+    "won't", 'wouldn', "wouldn't",
+])
+
+TECH_KEYWORDS = frozenset([
+    'python', 'java', 'javascript', 'sql', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'react', 'angular', 'vue', 'node',
+    'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
+    'git', 'ci/cd', 'agile', 'scrum', 'rest', 'api', 'graphql',
+    'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
+    'machine learning', 'data analysis', 'deep learning',
+    'cloud computing', 'devops', 'microservices'
+])
+
+# Single-pass matcher for every tech keyword, built once at import.
+# Plurals, version numbers and a 'js' suffix still count ('apis', 'python3',
+# 'reactjs'); only the bare keyword is captured. The closing word boundary
+# keeps 'java' from matching inside 'javascript', so alternation order does
+# not matter; the keywords are sorted only to keep the pattern deterministic
+TECH_KEYWORDS_RE = re.compile(
+    r'\b(' + '|'.join(re.escape(k) for k in sorted(TECH_KEYWORDS)) + r')(?:s|js|\d+)?\b'
+)
+
+# Boilerplate sections stripped from job descriptions, matched in one pass.
+# The text is cut at the earliest match of any pattern. Applying the patterns
+# one at a time could keep more text: a multi-part pattern such as
+# 'our company.*culture' lost its anchor once an earlier pattern had already
+# cut its tail.
+FLUFF_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in [
+        r'equal opportunity employer.*',
+        r'we are committed to.*diversity.*',
+        r'benefits include.*',
+        r'our company.*culture.*',
+        r'about us:.*',
+        r'company overview.*',
+        r'why join us.*',
+        r'perks and benefits.*',
+        r'we offer.*competitive.*',
+    ]),
+    re.IGNORECASE | re.DOTALL
+)
+
+# JavaScript libraries named like 'node.js' or 'next.js'
+JS_LIBRARY_RE = re.compile(r'\b\w+\.js\b')
 
 app = Flask(__name__, static_folder='build', static_url_path='')
 CORS(app)
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.stemmer = PorterStemmer()
-        self.stop_words = set(stopwords.words('english'))
-        
-        self.fluff_patterns = [
-            r'equal opportunity employer.*',
-            r'we are committed to.*diversity.*',
-            r'benefits include.*',
-            r'our company.*culture.*',
-            r'about us:.*',
-            r'company overview.*',
-            r'why join us.*',
-            r'perks and benefits.*',
-            r'we offer.*competitive.*',
-        ]
-        
-        self.tech_patterns = [
-            r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b',
-            r'\b[A-Z]{2,}\b',
-            r'\b\w+\.js\b',
-            r'\bC\+\+\b', r'\bC#\b',
-        ]
-        
     def extract_text_from_file(self, file):
-        """Extract text from PDF using PyPDF2"""
+        """Extract text from PDF using pypdf"""
         file_bytes = file.read()
         file_type = file.content_type
         
         try:
             if file_type == 'application/pdf':
-                # Use PyPDF2 for PDF extraction
-                import PyPDF2
+                # Use pypdf for PDF extraction
                 pdf_file = io.BytesIO(file_bytes)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                pdf_reader = pypdf.PdfReader(pdf_file)
                 
-                text = ''
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + '\n'
-                return text
+                return '\n'.join(page.extract_text() or '' for page in pdf_reader.pages)
             else:
                 # For images, return error message
                 return "Image upload not supported. Please upload a text-based PDF resume."
         except Exception as e:
             raise Exception(f"Text extraction failed: {str(e)}")
     
-    def clean_job_description(self, jd_text):
-        """Step 1: Strip job description to raw text"""
-        cleaned = jd_text.lower()
-        for pattern in self.fluff_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE | re.DOTALL)
-        return cleaned
+    def clean_job_description(self, jd_lower):
+        """Step 1: Strip lowercased job description to raw text"""
+        return FLUFF_RE.sub('', jd_lower)
     
     def extract_hard_skills(self, text):
-        """Step 2: Identify hard skill nouns"""
-        hard_skills = set()
-        
-        for pattern in self.tech_patterns:
-            matches = re.findall(pattern, text)
-            hard_skills.update(matches)
-        
-        tech_keywords = [
-            'python', 'java', 'javascript', 'sql', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'react', 'angular', 'vue', 'node',
-            'tensorflow', 'pytorch', 'scikit-learn', 'pandas', 'numpy',
-            'git', 'ci/cd', 'agile', 'scrum', 'rest', 'api', 'graphql',
-            'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-            'machine learning', 'data analysis', 'deep learning',
-            'cloud computing', 'devops', 'microservices'
-        ]
-        
-        text_lower = text.lower()
-        for keyword in tech_keywords:
-            if keyword in text_lower:
-                hard_skills.add(keyword)
-        
+        """Step 2: Identify hard skill nouns in lowercased text"""
+        hard_skills = set(JS_LIBRARY_RE.findall(text))
+        hard_skills.update(TECH_KEYWORDS_RE.findall(text))
         return hard_skills
     
-    def extract_keywords(self, text):
-        """Extract all meaningful keywords"""
-        tokens = word_tokenize(text.lower())
-        keywords = [
-            token for token in tokens 
-            if token.isalnum() and len(token) > 2 
-            and token not in self.stop_words
-        ]
-        
-        bigrams = [' '.join(keywords[i:i+2]) for i in range(len(keywords)-1)]
-        trigrams = [' '.join(keywords[i:i+3]) for i in range(len(keywords)-2)]
-        
-        all_keywords = keywords + bigrams + trigrams
-        return all_keywords
-    
-    def find_repeated_phrases(self, text):
-        """Step 3: Extract repeated phrases"""
-        keywords = self.extract_keywords(text)
-        counter = Counter(keywords)
-        repeated = {k: v for k, v in counter.items() if v >= 2}
-        return repeated
-    
-    def normalize_verbs(self, text):
-        """Step 4: Convert verbs to root forms"""
-        tokens = word_tokenize(text.lower())
-        stemmed = [self.stemmer.stem(token) for token in tokens]
-        return ' '.join(stemmed)
+    def find_repeated_phrases(self, term_counts, feature_names):
+        """Step 3: Extract repeated phrases from a document's term-count row"""
+        repeated = term_counts.data >= 2
+        terms = term_counts.indices[repeated]
+        counts = term_counts.data[repeated]
+        # Highest count first, like Counter.most_common(). Ties keep first-seen
+        # order because CountVectorizer stores row indices in the order terms
+        # were first seen; sorting the vocabulary remaps them without re-sorting
+        order = np.argsort(-counts, kind='stable')
+        return [(feature_names[i], int(c)) for i, c in zip(terms[order], counts[order])]
     
     def extract_implicit_keywords(self, text):
-        """Step 5: Extract implicit keywords"""
+        """Step 4: Extract implicit keywords from lowercased text"""
         implicit_map = {
             'cross functional': ['communication', 'collaboration', 'teamwork'],
             'end to end': ['project management', 'ownership', 'accountability'],
@@ -143,44 +131,74 @@ class ResumeAnalyzer:
         }
         
         implicit_skills = set()
-        text_lower = text.lower()
-        
         for phrase, skills in implicit_map.items():
-            if phrase in text_lower:
+            if phrase in text:
                 implicit_skills.update(skills)
         
         return implicit_skills
     
     def calculate_match_score(self, resume_text, jd_text):
         """Calculate comprehensive matching score"""
-        jd_cleaned = self.clean_job_description(jd_text)
-        
-        jd_keywords = set(self.extract_keywords(jd_cleaned))
-        resume_keywords = set(self.extract_keywords(resume_text.lower()))
+        # Lowercase each document once; every step below expects it
+        jd_lower = jd_text.lower()
+        resume_lower = resume_text.lower()
+        jd_cleaned = self.clean_job_description(jd_lower)
+        
+        # One vectorizer pass yields the 1-3 gram keywords for both documents,
+        # their raw counts and the TF-IDF weights used for the coverage score
+        vectorizer = CountVectorizer(
+            ngram_range=(1, 3),
+            stop_words=list(STOP_WORDS),
+            token_pattern=r'[A-Za-z0-9]{3,}',
+            lowercase=False,
+            # float32 halves matrix memory; this is safe only because the
+            # similarity is rounded before int() truncates the coverage score
+            dtype=np.float32,
+        )
+        try:
+            count_matrix = vectorizer.fit_transform([jd_cleaned, resume_lower])
+        except ValueError:
+            # Raised when neither document contains a single usable term
+            count_matrix = None
+        
+        if count_matrix is not None:
+            tfidf_matrix = TfidfTransformer().fit_transform(count_matrix)
+            feature_names = vectorizer.get_feature_names_out()
+            jd_terms = tfidf_matrix[0].indices
+            resume_terms = tfidf_matrix[1].indices
+            # Compare vocabulary indices so the resume's terms never become a
+            # set of strings; only JD terms are materialized
+            matched_keywords = set(feature_names[
+                np.intersect1d(jd_terms, resume_terms, assume_unique=True)
+            ])
+            missing_keywords = set(feature_names[
+                np.setdiff1d(jd_terms, resume_terms, assume_unique=True)
+            ])
+            jd_keyword_count = len(jd_terms)
+            # Rows are already L2-normalized, so their dot product is the cosine
+            similarity = float(tfidf_matrix[0].multiply(tfidf_matrix[1]).sum())
+            # Rounding error can leave identical documents at 0.9999999..., which
+            # int() would truncate to 99, so round and clamp before scoring
+            similarity = min(1.0, round(similarity, 6))
+            coverage_score = similarity * 100
+            jd_repeated = self.find_repeated_phrases(count_matrix[0], feature_names)
+        else:
+            matched_keywords, missing_keywords = set(), set()
+            jd_keyword_count = 0
+            coverage_score = 0
+            jd_repeated = []
         
         jd_hard_skills = self.extract_hard_skills(jd_cleaned)
-        resume_hard_skills = self.extract_hard_skills(resume_text.lower())
+        resume_hard_skills = self.extract_hard_skills(resume_lower)
         
-        jd_repeated = self.find_repeated_phrases(jd_cleaned)
         jd_implicit = self.extract_implicit_keywords(jd_cleaned)
         
-        matched_keywords = jd_keywords.intersection(resume_keywords)
-        missing_keywords = jd_keywords - resume_keywords
-        
         matched_hard_skills = jd_hard_skills.intersection(resume_hard_skills)
         missing_hard_skills = jd_hard_skills - resume_hard_skills
         
-        keyword_score = (len(matched_keywords) / len(jd_keywords) * 100) if jd_keywords else 0
+        keyword_score = (len(matched_keywords) / jd_keyword_count * 100) if jd_keyword_count else 0
         hard_skills_score = (len(matched_hard_skills) / len(jd_hard_skills) * 100) if jd_hard_skills else 0
         
-        vectorizer = TfidfVectorizer()
-        try:
-            tfidf_matrix = vectorizer.fit_transform([jd_cleaned, resume_text.lower()])
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            coverage_score = similarity * 100
-        except:
-            coverage_score = 0
-        
         overall_score = int(
             keyword_score * 0.4 +
             hard_skills_score * 0.4 +
@@ -194,7 +212,7 @@ class ResumeAnalyzer:
                 f"Add {min(5, len(missing_hard_skills))} missing hard skills: {', '.join(list(missing_hard_skills)[:5])}"
             )
         
-        top_repeated = sorted(jd_repeated.items(), key=lambda x: x[1], reverse=True)[:3]
+        top_repeated = jd_repeated[:3]
         if top_repeated:
             recommendations.append(
                 f"Emphasize these repeated phrases: {', '.join([k for k, v in top_repeated])}"
@@ -220,8 +238,8 @@ class ResumeAnalyzer:
             'keyword_score': int(keyword_score),
             'hard_skills_score': int(hard_skills_score),
             'coverage_score': int(coverage_score),
-            'matched_keywords': sorted(list(matched_keywords))[:30],
-            'missing_keywords': sorted(list(missing_keywords))[:30],
+            'matched_keywords': heapq.nsmallest(30, matched_keywords),
+            'missing_keywords': heapq.nsmallest(30, missing_keywords),
             'matched_hard_skills': sorted(list(matched_hard_skills)),
             'missing_hard_skills': sorted(list(missing_hard_skills)),
             'recommendations': recommendations